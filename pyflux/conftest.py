@@ -0,0 +1,33 @@
+import pytest
+
+# Options and markers live here rather than in the per-directory test conftests, so that they
+# are registered before argument parsing (e.g. under ``py.test --pyargs pyflux``)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False,
+        help="also run the full-length (slow) BBVI and M-H tests")
+    parser.addoption("--elbo-iterations", action="store", type=int, default=30,
+        help="number of BBVI iterations for the ELBO tests (at least 15)")
+
+
+def pytest_configure(config):
+    # The ELBO tests compare two 5-record windows after the optimizer's 5-iteration warm-up
+    if config.getoption("--elbo-iterations") < 15:
+        raise pytest.UsageError("--elbo-iterations must be at least 15")
+
+    config.addinivalue_line("markers", "slow: full-length fit, only run with --run-slow")
+    # Registered here so the marker is known even when pytest-xdist is not installed
+    config.addinivalue_line("markers", "xdist_group(name): run tests sharing a cached fit on the same xdist worker")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skips tests marked as slow unless --run-slow is given
+    """
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow: use --run-slow to run")
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
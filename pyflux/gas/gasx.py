@@ -810,7 +810,7 @@ class GASX(tsm.TSM):
             plt.ylabel(self.data_name)
             plt.show()
 
-    def predict_is(self, h=5, fit_once=True, fit_method='MLE', intervals=False):
+    def predict_is(self, h=5, fit_once=True, fit_method='MLE', intervals=False, **kwargs):
         """ Makes dynamic in-sample predictions with the estimated model
 
         Parameters
@@ -827,6 +827,9 @@ class GASX(tsm.TSM):
         intervals : boolean (default: False)
             Whether to return prediction intervals
 
+        nsims : int (default : 15000)
+            How many simulations to draw when simulating predictions
+
         Returns
         ----------
         - pd.DataFrame with predicted values
@@ -845,11 +848,11 @@ class GASX(tsm.TSM):
                 if fit_once is True:
                     x.fit(method=fit_method, printer=False)
                     saved_lvs = x.latent_variables
-                predictions = x.predict(1, oos_data=data2, intervals=intervals)
+                predictions = x.predict(1, oos_data=data2, intervals=intervals, **kwargs)
             else:
                 if fit_once is True:
                     x.latent_variables = saved_lvs
-                predictions = pd.concat([predictions,x.predict(h=1, oos_data=data2, intervals=intervals)])
+                predictions = pd.concat([predictions,x.predict(h=1, oos_data=data2, intervals=intervals, **kwargs)])
     
         predictions.rename(columns={0:self.y_name}, inplace=True)
         predictions.index = self.index[-h:]
@@ -889,7 +892,7 @@ class GASX(tsm.TSM):
         plt.legend(loc=2)   
         plt.show()          
 
-    def predict(self, h=5, oos_data=None, intervals=False):
+    def predict(self, h=5, oos_data=None, intervals=False, **kwargs):
         """ Makes forecast with the estimated model
 
         Parameters
@@ -903,11 +906,16 @@ class GASX(tsm.TSM):
         intervals : boolean (default: False)
             Whether to return prediction intervals
 
+        nsims : int (default : 15000)
+            How many simulations to draw when simulating predictions
+
         Returns
         ----------
         - pd.DataFrame with predicted values
         """     
 
+        nsims = kwargs.get('nsims', 15000)
+
         if self.latent_variables.estimated is False:
             raise Exception("No latent variables estimated!")
         else:
@@ -918,7 +926,7 @@ class GASX(tsm.TSM):
             date_index = self.shift_dates(h)
 
             if self.latent_variables.estimation_method in ['M-H']:
-                sim_vector = self._sim_prediction_bayes(h, X_pred, 15000)
+                sim_vector = self._sim_prediction_bayes(h, X_pred, nsims)
 
                 forecasted_values = np.array([np.mean(i) for i in sim_vector])
                 prediction_01 = np.array([np.percentile(i, 1) for i in sim_vector])
@@ -930,7 +938,7 @@ class GASX(tsm.TSM):
                 t_z = self.transform_z()
                 mean_values = self._mean_prediction(theta, Y, scores, h, t_z, X_pred)
                 if intervals is True:
-                    sim_values = self._sim_prediction(theta, Y, scores, h, t_z, X_pred, 15000)
+                    sim_values = self._sim_prediction(theta, Y, scores, h, t_z, X_pred, nsims)
                 else:
                     sim_values = self._sim_prediction(theta, Y, scores, h, t_z, X_pred, 2)
 
@@ -947,7 +955,6 @@ class GASX(tsm.TSM):
             else:
                 # Get mean prediction and simulations (for errors)
                 if self.latent_variables.estimation_method not in ['M-H']:
-                    sim_values = self._sim_prediction(theta, Y, scores, h, t_z, X_pred, 15000)
                     prediction_01 = np.array([np.percentile(i, 1) for i in sim_values])
                     prediction_05 = np.array([np.percentile(i, 5) for i in sim_values])
                     prediction_95 = np.array([np.percentile(i, 95) for i in sim_values])
@@ -0,0 +1,149 @@
+import os
+import random
+
+import numpy as np
+import pytest
+import pyflux as pf
+
+_HERE = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# The xdist group of each fixture that hands out a cached fit
+_FIT_GROUPS = {'mle_fit': 'mle', 'mle_model': 'mle', 'bbvi_model': 'bbvi', 'mh_model': 'mh'}
+
+# Fitted models shared between tests (and between test files), keyed on
+# everything that determines the outcome of the fit
+_MODEL_CACHE = {}
+
+# Forecasts made with the cached models, keyed on the model and the forecast arguments
+_PREDICTION_CACHE = {}
+
+
+def _fit_gasx(data, formula, ar, sc, family, method=None, seed=None, **kwargs):
+    """ Fits a GASX model, reusing a previous fit with identical arguments if there is one
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data for the model (cached by identity, so use module-level data)
+
+    formula : string
+        Patsy string describing the regression
+
+    ar : int
+        Number of autoregressive lags
+
+    sc : int
+        Number of score function lags
+
+    family : GAS family object
+        Which distribution to use
+
+    method : str
+        A fitting method (e.g 'MLE'). Defaults to model specific default method.
+
+    seed : int or None
+        If given, seeds numpy's global generator before fitting (only when the fit actually runs)
+
+    Returns
+    ----------
+    - (model, results) tuple
+    """
+    key = (id(data), formula, ar, sc, family.__class__.__name__, method, seed, frozenset(kwargs.items()))
+
+    if key not in _MODEL_CACHE:
+        if seed is not None:
+            np.random.seed(seed)
+        model = pf.GASX(formula=formula, data=data, ar=ar, sc=sc, family=family)
+        _MODEL_CACHE[key] = (model, model.fit(method, **kwargs))
+
+    return _MODEL_CACHE[key]
+
+
+def _predict_gasx(model, h, oos_data=None, intervals=False, **kwargs):
+    """ Forecasts with a fitted GASX model, reusing a previous forecast with identical arguments if there is one
+
+    Parameters
+    ----------
+    model : GASX
+        A fitted model (cached by identity, so use models from the model cache)
+
+    h : int
+        How many steps to forecast
+
+    oos_data : pd.DataFrame
+        Out-of-sample data for predict (cached by identity, so use module-level data);
+        if None, makes in-sample forecasts with predict_is
+
+    intervals : boolean (default: False)
+        Whether to return prediction intervals
+
+    Returns
+    ----------
+    - pd.DataFrame with predicted values (shared between tests, so do not modify it)
+    """
+    key = (id(model), h, id(oos_data), intervals, frozenset(kwargs.items()))
+
+    # The entry keeps references to the model and data, so a reused id cannot return a stale forecast
+    cached = _PREDICTION_CACHE.get(key)
+    if cached is None or cached[0] is not model or cached[1] is not oos_data:
+        if oos_data is None:
+            predictions = model.predict_is(h=h, intervals=intervals, **kwargs)
+        else:
+            predictions = model.predict(h=h, oos_data=oos_data, intervals=intervals, **kwargs)
+        _PREDICTION_CACHE[key] = (model, oos_data, predictions)
+
+    return _PREDICTION_CACHE[key][2]
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _seed_all():
+    """
+    Seeds the random number generators (pyflux draws from numpy's global one) so runs are reproducible
+    """
+    np.random.seed(0)
+    random.seed(0)
+
+
+@pytest.fixture(scope="session")
+def fitted_gasx():
+    """
+    Returns a function that fits (or fetches an already fitted) GASX model
+    """
+    return _fit_gasx
+
+
+@pytest.fixture(scope="session")
+def predicted_gasx():
+    """
+    Returns a function that forecasts with (or fetches forecasts already made by) a cached GASX model
+    """
+    return _predict_gasx
+
+
+@pytest.fixture(scope="session")
+def elbo_iterations(request):
+    """
+    Number of BBVI iterations to run in the ELBO tests
+    """
+    return request.config.getoption("--elbo-iterations")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Groups the tests in this directory by the cached fit they use, so that under
+    ``py.test -n auto --dist loadgroup`` each fit happens on a single worker
+    """
+    for item in items:
+        if not str(item.fspath).startswith(_HERE):
+            continue
+
+        group = None
+        for name in item.fixturenames:
+            if name in _FIT_GROUPS:
+                group = _FIT_GROUPS[name]
+                break
+        if group is not None:
+            params = getattr(item, 'callspec', None)
+            if params is not None and 'formula' in params.params:
+                group = "%s[%s]" % (group, params.params['formula'])
+            item.add_marker(pytest.mark.xdist_group(name="%s-%s" % (item.module.__name__, group)))
@@ -1,496 +1,291 @@
+import os
+
 import numpy as np
+import pytest
 import pandas as pd
 import pyflux as pf
 
-# Set up some data to use for the tests
-
-countdata = np.random.poisson(3,500)
-x1 = np.random.normal(0,1,500)
-x2 = np.random.normal(0,1,500)
-data = pd.DataFrame([countdata,x1,x2]).T
-data.columns = ['y', 'x1', 'x2']
-
-x1_oos = np.random.normal(0,1,30)
-x2_oos = np.random.normal(0,1,30)
-countdata_oos = np.random.poisson(3,30)
-
-data_oos = pd.DataFrame([countdata_oos,x1_oos,x2_oos]).T
-data_oos.columns = ['y', 'x1', 'x2']
-
-
-def test_poisson_no_terms():
-    """
-    Tests the length of the latent variable vector for an GASX model
-    with no AR or SC terms, and tests that the values are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=0, sc=0, family=pf.Poisson())
-    x = model.fit()
-    assert(len(model.latent_variables.z_list) == 2)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
-
-def test_poisson_couple_terms():
-    """
-    Tests the length of the latent variable vector for an GASX model
-    with 1 AR and 1 SC term, and tests that the values are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
-
-def test_poisson_bbvi():
-    """
-    Tests an GASX model estimated with BBVI, and tests that the latent variable
-    vector length is correct, and that value are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=100)
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
-
-def test_bbvi_mini_batch():
-    """
-    Tests an GASX model estimated with BBVI and that the length of the latent variable
-    list is correct, and that the estimated latent variables are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, mini_batch=32)
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
-
-def test_bbvi_elbo():
-    """
-    Tests that the ELBO increases
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, record_elbo=True, map_start=False)
-    assert(x.elbo_records[-1]>x.elbo_records[0])
-
-def test_bbvi_mini_batch_elbo():
-    """
-    Tests that the ELBO increases
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, mini_batch=32, record_elbo=True, map_start=False)
-    assert(x.elbo_records[-1]>x.elbo_records[0])
-
-def test_poisson_mh():
-    """
-    Tests an GASX model estimated with Metropolis-Hastings, and tests that the latent variable
-    vector length is correct, and that value are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H',nsims=300)
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+# Set up some data to use for the tests (seeded so cached fits are reproducible)
 
-def test_poisson_laplace():
-    """
-    Tests an GASX model estimated with Laplace approximation, and tests that the latent variable
-    vector length is correct, and that value are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('Laplace')
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+rng = np.random.RandomState(0)
 
-def test_poisson_pml():
-    """
-    Tests an GASX model estimated with PML, and tests that the latent variable
-    vector length is correct, and that value are not nan
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('PML')
-    assert(len(model.latent_variables.z_list) == 4)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
-
-def test_poisson_predict_length():
-    """
-    Tests that the length of the predict dataframe is equal to no of steps h
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(model.predict(h=5, oos_data=data_oos).shape[0] == 5)
-
-def test_poisson_predict_is_length():
-    """
-    Tests that the length of the predict IS dataframe is equal to no of steps h
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    assert(model.predict_is(h=5).shape[0] == 5)
-
-def test_poisson_predict_nans():
-    """
-    Tests that the predictions are not NaNs
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(len(model.predict(h=5, oos_data=data_oos).values[np.isnan(model.predict(h=5, 
-        oos_data=data_oos).values)]) == 0)
+countdata = rng.poisson(3,500).astype(np.float64)
+x1 = rng.standard_normal(500)
+x2 = rng.standard_normal(500)
+data = pd.DataFrame({'y': countdata, 'x1': x1, 'x2': x2}, columns=['y', 'x1', 'x2'])
 
-def test_poisson_predict_is_nans():
-    """
-    Tests that the predictions in-sample are not NaNs
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(len(model.predict_is(h=5).values[np.isnan(model.predict_is(h=5).values)]) == 0)
+countdata_oos = rng.poisson(3,30).astype(np.float64)
+x1_oos = rng.standard_normal(30)
+x2_oos = rng.standard_normal(30)
+data_oos = pd.DataFrame({'y': countdata_oos, 'x1': x1_oos, 'x2': x2_oos}, columns=['y', 'x1', 'x2'])
 
-def test_predict_nonconstant():
-    """
-    We should not really have predictions that are constant (should be some difference)...
-    This captures bugs with the predict function not iterating forward
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    assert(not np.all(predictions.values==predictions.values[0]))
-    
-def test_predict_is_nonconstant():
-    """
-    We should not really have predictions that are constant (should be some difference)...
-    This captures bugs with the predict function not iterating forward
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    assert(not np.all(predictions.values==predictions.values[0]))
-    
-def test_predict_intervals():
-    """
-    Tests prediction intervals are ordered correctly
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    model.fit()
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
+# Simulations for the prediction interval tests (GASX defaults to 15000)
+N_PREDICT_SIMS = int(os.environ.get('PYFLUX_TEST_SIMS', 200))
 
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+# Each test runs with one and with two predictors; nz is the expected number of latent variables
+formulas = pytest.mark.parametrize("formula", ["y ~ x1", "y ~ x1 + x2"])
+formulas_no_terms = pytest.mark.parametrize("formula,nz", [("y ~ x1", 2), ("y ~ x1 + x2", 3)])
+formulas_couple_terms = pytest.mark.parametrize("formula,nz", [("y ~ x1", 4), ("y ~ x1 + x2", 5)])
 
-def test_predict_is_intervals():
-    """
-    Tests prediction intervals are ordered correctly
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    model.fit()
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
 
-def test_predict_intervals_bbvi():
-    """
-    Tests prediction intervals are ordered correctly
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
+def _assert_no_nan(predictions):
+    assert(not np.isnan(predictions.values).any())
 
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+def _assert_intervals_ordered(predictions):
+    # Poisson draws are integers, so neighbouring percentiles can tie; only the outer band must be strict
+    intervals = predictions[['1% Prediction Interval', '5% Prediction Interval',
+        '95% Prediction Interval', '99% Prediction Interval']].values
+    assert(np.all(np.diff(intervals, axis=1) >= 0))
+    assert(np.all(intervals[:, -1] > intervals[:, 0]))
 
-def test_predict_is_intervals_bbvi():
-    """
-    Tests prediction intervals are ordered correctly
-    """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+def _assert_elbo_increases(elbo_records):
+    # The stochastic optimizers skip their first 5 updates, so the records only start moving after that
+    assert(np.mean(elbo_records[-5:]) > np.mean(elbo_records[5:10]))
 
-def test_predict_intervals_mh():
+@pytest.fixture
+def mle_fit(fitted_gasx, formula):
     """
-    Tests prediction intervals are ordered correctly
+    A (model, results) pair for a GASX model estimated once per formula with MLE and shared between tests
     """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H', nsims=400)
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
+    return fitted_gasx(data, formula, ar=1, sc=1, family=pf.Poisson())
 
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
-
-def test_predict_is_intervals_mh():
+@pytest.fixture
+def mle_model(mle_fit):
     """
-    Tests prediction intervals are ordered correctly
+    The model from mle_fit
     """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H', nsims=400)
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+    model, x = mle_fit
+    return model
 
-def test_sample_model():
+@pytest.fixture
+def bbvi_model(fitted_gasx, formula):
     """
-    Tests sampling function
+    A GASX model estimated once per formula with BBVI and shared between tests
     """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    sample = model.sample(nsims=100)
-    assert(sample.shape[0]==100)
-    assert(sample.shape[1]==len(data)-1)
+    model, x = fitted_gasx(data, formula, ar=1, sc=1, family=pf.Poisson(), method='BBVI', seed=0, iterations=100)
+    return model
 
-def test_ppc():
+@pytest.fixture
+def mh_model(fitted_gasx, formula):
     """
-    Tests PPC value
+    A GASX model estimated once per formula with Metropolis-Hastings and shared between tests
     """
-    model = pf.GASX(formula="y ~ x1", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    p_value = model.ppc()
-    assert(0.0 <= p_value <= 1.0)
-
-
-
-
+    model, x = fitted_gasx(data, formula, ar=1, sc=1, family=pf.Poisson(), method='M-H', seed=0, nsims=400)
+    return model
 
 
-
-## Try more than one predictor
-
-def test2_poisson_no_terms():
+@formulas_no_terms
+def test_poisson_no_terms(formula, nz):
     """
     Tests the length of the latent variable vector for an GASX model
-    with no AR or SC terms, and two predictors, and tests that the values 
-    are not nan
+    with no AR or SC terms, and tests that the values are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=0, sc=0, family=pf.Poisson())
+    model = pf.GASX(formula=formula, data=data, ar=0, sc=0, family=pf.Poisson())
     x = model.fit()
-    assert(len(model.latent_variables.z_list) == 3)
+    assert(len(model.latent_variables.z_list) == nz)
     lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(not np.isnan(lvs).any())
 
-def test2_poisson_couple_terms():
+@formulas_couple_terms
+def test_poisson_couple_terms(mle_model, nz):
     """
     Tests the length of the latent variable vector for an GASX model
-    with 1 AR and 1 SC term, and two predictors, and tests that the values 
-    are not nan
+    with 1 AR and 1 SC term, and tests that the values are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    assert(len(model.latent_variables.z_list) == 5)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(len(mle_model.latent_variables.z_list) == nz)
+    lvs = np.array([i.value for i in mle_model.latent_variables.z_list])
+    assert(not np.isnan(lvs).any())
 
-def test2_poisson_bbvi():
+@formulas_couple_terms
+def test_poisson_bbvi(bbvi_model, nz):
     """
-    Tests an GASX model estimated with BBVI, with multiple predictors, and 
-    tests that the latent variable vector length is correct, and that value are not nan
+    Tests an GASX model estimated with BBVI, and tests that the latent variable
+    vector length is correct, and that value are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    assert(len(model.latent_variables.z_list) == 5)
-    lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(len(bbvi_model.latent_variables.z_list) == nz)
+    lvs = np.array([i.value for i in bbvi_model.latent_variables.z_list])
+    assert(not np.isnan(lvs).any())
 
-def test_bbvi_mini_batch():
+@formulas_couple_terms
+@pytest.mark.parametrize("iterations", [50, pytest.param(500, marks=pytest.mark.slow)])
+def test_bbvi_mini_batch(formula, nz, iterations):
     """
     Tests an GASX model estimated with BBVI and that the length of the latent variable
     list is correct, and that the estimated latent variables are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, mini_batch=32)
-    assert(len(model.latent_variables.z_list) == 5)
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
+    x = model.fit('BBVI',iterations=iterations, mini_batch=32)
+    assert(len(model.latent_variables.z_list) == nz)
     lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(not np.isnan(lvs).any())
 
-def test_bbvi_elbo():
+@formulas
+def test_bbvi_elbo(formula, elbo_iterations):
     """
     Tests that the ELBO increases
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, record_elbo=True, map_start=False)
-    assert(x.elbo_records[-1]>x.elbo_records[0])
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
+    x = model.fit('BBVI',iterations=elbo_iterations, record_elbo=True, map_start=False)
+    _assert_elbo_increases(x.elbo_records)
 
-def test_bbvi_mini_batch_elbo():
+@formulas
+def test_bbvi_mini_batch_elbo(formula, elbo_iterations):
     """
     Tests that the ELBO increases
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI',iterations=500, mini_batch=32, record_elbo=True, map_start=False)
-    assert(x.elbo_records[-1]>x.elbo_records[0])
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
+    x = model.fit('BBVI',iterations=elbo_iterations, mini_batch=32, record_elbo=True, map_start=False)
+    _assert_elbo_increases(x.elbo_records)
 
-def test2_poisson_mh():
+@formulas_couple_terms
+@pytest.mark.parametrize("nsims", [50, pytest.param(300, marks=pytest.mark.slow)])
+def test_poisson_mh(formula, nz, nsims):
     """
-    Tests an GASX model estimated with MEtropolis-Hastings, with multiple predictors, and 
-    tests that the latent variable vector length is correct, and that value are not nan
+    Tests an GASX model estimated with Metropolis-Hastings, and tests that the latent variable
+    vector length is correct, and that value are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H', nsims=300)
-    assert(len(model.latent_variables.z_list) == 5)
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
+    x = model.fit('M-H',nsims=nsims)
+    assert(len(model.latent_variables.z_list) == nz)
     lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(not np.isnan(lvs).any())
 
-def test2_poisson_laplace():
+@formulas_couple_terms
+def test_poisson_laplace(formula, nz):
     """
-    Tests an GASX model estimated with Laplace, with multiple predictors, and 
-    tests that the latent variable vector length is correct, and that value are not nan
+    Tests an GASX model estimated with Laplace approximation, and tests that the latent variable
+    vector length is correct, and that value are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
     x = model.fit('Laplace')
-    assert(len(model.latent_variables.z_list) == 5)
+    assert(len(model.latent_variables.z_list) == nz)
     lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(not np.isnan(lvs).any())
 
-def test2_poisson_pml():
+@formulas_couple_terms
+def test_poisson_pml(formula, nz):
     """
-    Tests an GASX model estimated with PML, with multiple predictors, and 
-    tests that the latent variable vector length is correct, and that value are not nan
+    Tests an GASX model estimated with PML, and tests that the latent variable
+    vector length is correct, and that value are not nan
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
+    model = pf.GASX(formula=formula, data=data, ar=1, sc=1, family=pf.Poisson())
     x = model.fit('PML')
-    assert(len(model.latent_variables.z_list) == 5)
+    assert(len(model.latent_variables.z_list) == nz)
     lvs = np.array([i.value for i in model.latent_variables.z_list])
-    assert(len(lvs[np.isnan(lvs)]) == 0)
+    assert(not np.isnan(lvs).any())
+
+@formulas
+def test_summary_runs(mle_fit):
+    """
+    Tests that the summary of the results prints without error
+    """
+    model, x = mle_fit
+    try:
+        x.summary()
+    except Exception as e:
+        pytest.fail("summary() raised %r" % e)
 
-def test2_poisson_predict_length():
+@formulas
+def test_poisson_predict_length(mle_model, predicted_gasx):
     """
     Tests that the length of the predict dataframe is equal to no of steps h
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(model.predict(h=5, oos_data=data_oos).shape[0] == 5)
+    assert(predicted_gasx(mle_model, 5, oos_data=data_oos).shape[0] == 5)
 
-def test2_poisson_predict_is_length():
+@formulas
+def test_poisson_predict_is_length(mle_model, predicted_gasx):
     """
     Tests that the length of the predict IS dataframe is equal to no of steps h
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    assert(model.predict_is(h=5).shape[0] == 5)
+    assert(predicted_gasx(mle_model, 5).shape[0] == 5)
 
-def test2_poisson_predict_nans():
+@formulas
+def test_poisson_predict_nans(mle_model, predicted_gasx):
     """
     Tests that the predictions are not NaNs
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(len(model.predict(h=5, oos_data=data_oos).values[np.isnan(model.predict(h=5, 
-        oos_data=data_oos).values)]) == 0)
+    predictions = predicted_gasx(mle_model, 5, oos_data=data_oos)
+    _assert_no_nan(predictions)
 
-def test2_poisson_predict_is_nans():
+@formulas
+def test_poisson_predict_is_nans(mle_model, predicted_gasx):
     """
     Tests that the predictions in-sample are not NaNs
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit()
-    x.summary()
-    assert(len(model.predict_is(h=5).values[np.isnan(model.predict_is(h=5).values)]) == 0)
+    predictions = predicted_gasx(mle_model, 5)
+    _assert_no_nan(predictions)
 
-def test2_predict_nonconstant():
+@formulas
+def test_predict_nonconstant(mle_model, predicted_gasx):
     """
     We should not really have predictions that are constant (should be some difference)...
     This captures bugs with the predict function not iterating forward
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
+    predictions = predicted_gasx(mle_model, 10, oos_data=data_oos, intervals=False)
     assert(not np.all(predictions.values==predictions.values[0]))
-    
-def test2_predict_is_nonconstant():
+
+@formulas
+def test_predict_is_nonconstant(mle_model, predicted_gasx):
     """
     We should not really have predictions that are constant (should be some difference)...
     This captures bugs with the predict function not iterating forward
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
+    predictions = predicted_gasx(mle_model, 10, intervals=False)
     assert(not np.all(predictions.values==predictions.values[0]))
-    
-def test2_predict_intervals():
-    """
-    Tests prediction intervals are ordered correctly
-    """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    model.fit()
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
 
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
-
-def test2_predict_is_intervals():
+@formulas
+def test_predict_intervals(mle_model, predicted_gasx):
     """
     Tests prediction intervals are ordered correctly
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    model.fit()
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+    predictions = predicted_gasx(mle_model, 10, oos_data=data_oos, intervals=True, nsims=N_PREDICT_SIMS)
+    _assert_intervals_ordered(predictions)
 
-def test2_predict_intervals_bbvi():
+@formulas
+def test_predict_is_intervals(mle_model, predicted_gasx):
     """
     Tests prediction intervals are ordered correctly
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
-
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+    predictions = predicted_gasx(mle_model, 10, intervals=True, nsims=N_PREDICT_SIMS)
+    _assert_intervals_ordered(predictions)
 
-def test2_predict_is_intervals_bbvi():
+@formulas
+def test_predict_intervals_bbvi(bbvi_model, predicted_gasx):
     """
     Tests prediction intervals are ordered correctly
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+    predictions = predicted_gasx(bbvi_model, 10, oos_data=data_oos, intervals=True, nsims=N_PREDICT_SIMS)
+    _assert_intervals_ordered(predictions)
 
-def test2_predict_intervals_mh():
+@formulas
+def test_predict_is_intervals_bbvi(bbvi_model, predicted_gasx):
     """
     Tests prediction intervals are ordered correctly
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H', nsims=400)
-    predictions = model.predict(h=10, oos_data=data_oos, intervals=True)
+    predictions = predicted_gasx(bbvi_model, 10, intervals=True, nsims=N_PREDICT_SIMS)
+    _assert_intervals_ordered(predictions)
 
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
-
-def test2_predict_is_intervals_mh():
+@formulas
+def test_predict_intervals_mh(mh_model, predicted_gasx):
     """
     Tests prediction intervals are ordered correctly
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('M-H', nsims=400)
-    predictions = model.predict_is(h=10, intervals=True)
-    assert(np.all(predictions['99% Prediction Interval'].values > predictions['95% Prediction Interval'].values))
-    assert(np.all(predictions['95% Prediction Interval'].values > predictions['5% Prediction Interval'].values))
-    assert(np.all(predictions['5% Prediction Interval'].values > predictions['1% Prediction Interval'].values))
+    predictions = predicted_gasx(mh_model, 10, oos_data=data_oos, intervals=True, nsims=N_PREDICT_SIMS)
+    _assert_intervals_ordered(predictions)
 
-def test2_sample_model():
+@formulas
+def test_sample_model(bbvi_model):
     """
     Tests sampling function
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    sample = model.sample(nsims=100)
+    sample = bbvi_model.sample(nsims=100)
     assert(sample.shape[0]==100)
     assert(sample.shape[1]==len(data)-1)
 
-def test2_ppc():
+@formulas
+def test_ppc(bbvi_model):
     """
     Tests PPC value
     """
-    model = pf.GASX(formula="y ~ x1 + x2", data=data, ar=1, sc=1, family=pf.Poisson())
-    x = model.fit('BBVI', iterations=100)
-    p_value = model.ppc()
+    p_value = bbvi_model.ppc()
     assert(0.0 <= p_value <= 1.0)
-